@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import os
 import csv
+import gzip
 import uuid
+import zlib
 from tkcalendar import Calendar, DateEntry
 from PIL import Image, ImageTk
 import sv_ttk  # For modern Fluent/Sun Valley theme
@@ -21,8 +23,8 @@ class ModernEventSystem(tk.Tk):
         sv_ttk.set_theme("light")
         
         # Initialize data
-        self.events_file = "events.json"
-        self.events = self.load_events()
+        self.init_storage()
+        self.archive_past_events()
         
         # Setup UI
         self.setup_ui()
@@ -82,16 +84,19 @@ class ModernEventSystem(tk.Tk):
         stats_frame.pack(fill="x", pady=10)
         stats_frame.grid_columnconfigure((0,1,2,3), weight=1)
 
-        # Calculate stats
-        total_events = len(self.events)
+        # Calculate stats (archived events are counted from the archive index)
+        archive_stats = self.archive_stats()
+        total_events = len(self.events) + sum(t['events'] for t in archive_stats.values())
         upcoming = len([e for e in self.events if not self.is_past_event(e)])
-        total_attendees = sum(len(e.get('attendees', [])) for e in self.events)
+        total_attendees = (sum(len(e.get('attendees', [])) for e in self.events)
+                           + sum(t['attendees'] for t in archive_stats.values()))
+        categories = set(e.get('category', 'Other') for e in self.events) | set(archive_stats)
         
         # Stats cards
         self.create_stat_card(stats_frame, "Total Events", total_events, "🎫", 0)
         self.create_stat_card(stats_frame, "Upcoming", upcoming, "📅", 1)
         self.create_stat_card(stats_frame, "Attendees", total_attendees, "👥", 2)
-        self.create_stat_card(stats_frame, "Categories", len(set(e.get('category') for e in self.events)), "🏷️", 3)
+        self.create_stat_card(stats_frame, "Categories", len(categories), "🏷️", 3)
 
         # Recent events section
         recent_frame = ttk.LabelFrame(self.main_frame, text="Recent Events", padding=10)
@@ -261,9 +266,7 @@ class ModernEventSystem(tk.Tk):
                 widget.destroy()
             
             selected_date = cal.get_date()
-            # Filter events for selected date
-            day_events = [e for e in self.events 
-                         if e.get('date') == selected_date]
+            day_events = self.events_on_date(selected_date)
             
             if not day_events:
                 ttk.Label(right_frame, text="No events on this date",
@@ -304,9 +307,29 @@ class ModernEventSystem(tk.Tk):
         events_list = tk.Listbox(left_frame, font=("Segoe UI", 10))
         events_list.pack(fill="both", expand=True)
         
+        # Archived events are loaded on demand and listed after the live ones (read-only)
+        listed_events = list(self.events)
+        show_archived = tk.BooleanVar(value=False)
+        
+        def populate_events_list():
+            listed_events[:] = list(self.events)
+            if show_archived.get():
+                listed_events.extend(self.query_archive())
+            events_list.delete(0, tk.END)
+            for index, event in enumerate(listed_events):
+                suffix = " (archived)" if index >= len(self.events) else ""
+                events_list.insert(tk.END, event['title'] + suffix)
+        
+        def is_archived(selection):
+            if selection[0] >= len(self.events):
+                messagebox.showwarning("Warning", "Archived events are read-only!")
+                return True
+            return False
+        
         # Populate events list
-        for event in self.events:
-            events_list.insert(tk.END, event['title'])
+        populate_events_list()
+        ttk.Checkbutton(left_frame, text="Show archived events", variable=show_archived,
+                       command=populate_events_list).pack(anchor="w", pady=(10, 0))
         
         # Right side - Attendees list
         right_frame = ttk.LabelFrame(container, text="Attendees", padding=10)
@@ -349,7 +372,7 @@ class ModernEventSystem(tk.Tk):
             if not selection:
                 return
             
-            event = self.events[selection[0]]
+            event = listed_events[selection[0]]
             
             # Update attendees list
             for attendee in event.get('attendees', []):
@@ -364,6 +387,8 @@ class ModernEventSystem(tk.Tk):
             if not selection:
                 messagebox.showwarning("Warning", "Please select an event first!")
                 return
+            if is_archived(selection):
+                return
             
             event = self.events[selection[0]]
             
@@ -410,6 +435,8 @@ class ModernEventSystem(tk.Tk):
             if not selection:
                 messagebox.showwarning("Warning", "Please select an event first!")
                 return
+            if is_archived(selection):
+                return
             
             attendee_selection = attendees_tree.selection()
             if not attendee_selection:
@@ -444,14 +471,18 @@ class ModernEventSystem(tk.Tk):
         stats_frame = ttk.LabelFrame(dashboard, text="Quick Statistics", padding=10)
         stats_frame.pack(fill="x", pady=(0, 20))
         
-        # Calculate statistics
+        # Calculate statistics (archived events come from the index, not the archive files)
         total_events = len(self.events)
         total_attendees = sum(len(e.get('attendees', [])) for e in self.events)
-        avg_attendance = total_attendees / total_events if total_events > 0 else 0
         categories = {}
         for event in self.events:
             cat = event.get('category', 'Other')
             categories[cat] = categories.get(cat, 0) + 1
+        for cat, totals in self.archive_stats().items():
+            total_events += totals['events']
+            total_attendees += totals['attendees']
+            categories[cat] = categories.get(cat, 0) + totals['events']
+        avg_attendance = total_attendees / total_events if total_events > 0 else 0
         most_popular = max(categories.items(), key=lambda x: x[1])[0] if categories else "N/A"
         
         # Display stats in grid
@@ -509,6 +540,32 @@ class ModernEventSystem(tk.Tk):
                   command=lambda: sv_ttk.set_theme("light")).pack(side="left", padx=5)
         ttk.Button(theme_frame, text="Dark", 
                   command=lambda: sv_ttk.set_theme("dark")).pack(side="left", padx=5)
+        
+        # Archiving of past events
+        archive_frame = ttk.Frame(settings_frame)
+        archive_frame.pack(fill="x", pady=10)
+        ttk.Label(archive_frame, text="Archive events older than").pack(side="left", padx=(0, 10))
+        days_var = tk.StringVar(value=str(self.archive_after_days))
+        ttk.Spinbox(archive_frame, from_=0, to=3650, width=6,
+                   textvariable=days_var).pack(side="left")
+        ttk.Label(archive_frame, text="days").pack(side="left", padx=(5, 10))
+        
+        def archive_now():
+            try:
+                days = int(days_var.get())
+                if days < 0:
+                    raise ValueError("Archive age cannot be negative")
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            self.archive_after_days = days
+            self.settings['archive_after_days'] = days
+            self.save_settings()
+            archived = self.archive_past_events()
+            messagebox.showinfo("Archive", f"Archived {archived} event(s).")
+        
+        ttk.Button(archive_frame, text="Archive Now",
+                  command=archive_now).pack(side="left", padx=5)
 
     def create_stat_card(self, parent, title, value, icon, column):
         card = ttk.Frame(parent, padding=15)
@@ -557,6 +614,16 @@ class ModernEventSystem(tk.Tk):
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
+    def init_storage(self):
+        self.events_file = "events.json"
+        self.settings_file = "settings.json"
+        self.archive_dir = "archive"
+        self.archive_index_file = os.path.join(self.archive_dir, "index.json")
+        self.settings = self.load_settings()
+        self.archive_after_days = self.settings.get('archive_after_days', 30)
+        self.events = self.load_events()
+        self.archive_index = self.load_archive_index()
+
     def load_events(self):
         try:
             if os.path.exists(self.events_file):
@@ -568,15 +635,207 @@ class ModernEventSystem(tk.Tk):
 
     def save_events(self):
         try:
-            with open(self.events_file, 'w') as file:
-                json.dump(self.events, file, indent=4)
+            self.write_json_atomic(self.events_file, self.events)
+            return True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save events: {str(e)}")
+            return False
 
-    def is_past_event(self, event):
-        event_date = datetime.strptime(f"{event['date']} {event.get('time', '00:00')}", 
+    def load_settings(self):
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r') as file:
+                    return json.load(file)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load settings: {str(e)}")
+        return {}
+
+    def save_settings(self):
+        try:
+            self.write_json_atomic(self.settings_file, self.settings)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
+
+    def load_archive_index(self):
+        try:
+            if os.path.exists(self.archive_index_file):
+                with open(self.archive_index_file, 'r') as file:
+                    return json.load(file)
+        except Exception:
+            pass
+        # The index is derived data, so rebuild it from the segments rather than
+        # starting empty and hiding every month the next archive run doesn't touch
+        return self.rebuild_archive_index()
+
+    def rebuild_archive_index(self):
+        index = {}
+        if not os.path.isdir(self.archive_dir):
+            return index
+        
+        try:
+            for name in sorted(os.listdir(self.archive_dir)):
+                if name.endswith(".jsonl.gz"):
+                    month = name[:-len(".jsonl.gz")]
+                    index[month] = self.build_month_index(self.read_archive_segment(month))
+            if index:
+                self.save_archive_index(index)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to rebuild archive index: {str(e)}")
+        return index
+
+    def save_archive_index(self, index):
+        self.write_json_atomic(self.archive_index_file, index)
+
+    def write_json_atomic(self, path, data):
+        # Write to a temp file and rename it so a failure never leaves a half-written file
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file, indent=4)
+        os.replace(tmp_path, path)
+
+    def archive_cutoff(self):
+        return datetime.now() - timedelta(days=self.archive_after_days)
+
+    def archive_past_events(self):
+        # Move events older than the cutoff (with their attendees) into
+        # append-only gzip segments, one per month, and drop them from the live store.
+        cutoff = self.archive_cutoff()
+        live, segments = [], {}
+        for event in self.events:
+            event_date = self.parse_event_datetime(event)
+            if event_date is not None and event_date < cutoff:
+                segments.setdefault(event_date.strftime("%Y-%m"), []).append(event)
+            else:
+                live.append(event)
+        
+        if not segments:
+            return 0
+        
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            index = dict(self.archive_index)
+            for month, month_events in segments.items():
+                # Skip events a previously interrupted run already archived
+                existing = self.read_archive_segment(month, repair=True)
+                archived_keys = {self.archive_key(e) for e in existing}
+                new_events = [e for e in month_events if self.archive_key(e) not in archived_keys]
+                
+                if new_events:
+                    # Appending in 'at' mode adds a new gzip member; readers see one stream
+                    with gzip.open(self.archive_segment_path(month), 'at', encoding='utf-8') as file:
+                        for event in new_events:
+                            file.write(json.dumps(event) + "\n")
+                
+                # Count from the segment itself so the index always matches what is on disk
+                index[month] = self.build_month_index(existing + new_events)
+            
+            # Only publish the index once every segment has been written
+            self.save_archive_index(index)
+            self.archive_index = index
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to archive events: {str(e)}")
+            return 0
+        
+        # If the live store cannot be saved the archived events stay in events.json,
+        # and the next run skips them by id instead of archiving them twice
+        self.events = live
+        if not self.save_events():
+            return 0
+        return sum(len(month_events) for month_events in segments.values())
+
+    def archive_key(self, event):
+        return event.get('id') or json.dumps(event, sort_keys=True)
+
+    def build_month_index(self, events):
+        month_index = {}
+        for event in events:
+            totals = month_index.setdefault(event.get('category', 'Other'),
+                                            {'events': 0, 'attendees': 0})
+            totals['events'] += 1
+            totals['attendees'] += len(event.get('attendees', []))
+        return month_index
+
+    def read_archive_segment(self, month, repair=False):
+        # An interrupted append leaves a truncated last gzip member; keep every
+        # complete line before it, and with repair=True rewrite the segment without it
+        path = self.archive_segment_path(month)
+        if not os.path.exists(path):
+            return []
+        
+        events, damaged = [], False
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith("\n"):
+                        damaged = True
+                        break
+                    events.append(json.loads(line))
+        except (EOFError, gzip.BadGzipFile, zlib.error, ValueError):
+            damaged = True
+        
+        if damaged and repair:
+            tmp_path = path + ".tmp"
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as file:
+                for event in events:
+                    file.write(json.dumps(event) + "\n")
+            os.replace(tmp_path, path)
+        return events
+
+    def archive_segment_path(self, month):
+        return os.path.join(self.archive_dir, f"{month}.jsonl.gz")
+
+    def query_archive(self, start_date=None, end_date=None, category=None):
+        # Dates are 'YYYY-MM-DD' strings; the index lets us skip whole
+        # months (and months without the category) without decompressing them.
+        results = []
+        for month in sorted(self.archive_index):
+            if start_date and month < start_date[:7]:
+                continue
+            if end_date and month > end_date[:7]:
+                continue
+            if category and category not in self.archive_index[month]:
+                continue
+            
+            try:
+                for event in self.read_archive_segment(month):
+                    if start_date and event.get('date', '') < start_date:
+                        continue
+                    if end_date and event.get('date', '') > end_date:
+                        continue
+                    if category and event.get('category', 'Other') != category:
+                        continue
+                    results.append(event)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read archive {month}: {str(e)}")
+        return results
+
+    def events_on_date(self, date):
+        # Archived events are looked up by what the index holds, not by the current
+        # threshold, which may have been raised since they were archived
+        day_events = [e for e in self.events if e.get('date') == date]
+        if date[:7] in self.archive_index:
+            day_events += self.query_archive(date, date)
+        return day_events
+
+    def archive_stats(self):
+        stats = {}
+        for month_index in self.archive_index.values():
+            for cat, totals in month_index.items():
+                entry = stats.setdefault(cat, {'events': 0, 'attendees': 0})
+                entry['events'] += totals['events']
+                entry['attendees'] += totals['attendees']
+        return stats
+
+    def parse_event_datetime(self, event):
+        try:
+            return datetime.strptime(f"{event['date']} {event.get('time', '00:00')}", 
                                      "%Y-%m-%d %H:%M")
-        return event_date < datetime.now()
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def is_past_event(self, event):
+        event_date = self.parse_event_datetime(event)
+        return event_date is not None and event_date < datetime.now()
 
     def center_window(self):
         self.update_idletasks()
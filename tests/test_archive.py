@@ -0,0 +1,185 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("tkcalendar")
+pytest.importorskip("sv_ttk")
+pytest.importorskip("PIL")
+
+import modern_event_system
+from modern_event_system import ModernEventSystem
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Build the object without starting Tk; only the storage attributes are needed
+    monkeypatch.chdir(tmp_path)
+    errors = []
+    monkeypatch.setattr(modern_event_system.messagebox, "showerror",
+                        lambda title, message: errors.append(message))
+    app = object.__new__(ModernEventSystem)
+    app.init_storage()
+    app.errors = errors
+    return app
+
+
+def make_event(event_id, date, category="Social", attendees=0):
+    return {
+        'id': event_id,
+        'title': f"Event {event_id}",
+        'date': date,
+        'category': category,
+        'attendees': [{'name': f"A{i}", 'email': f"a{i}@example.com"} for i in range(attendees)]
+    }
+
+
+def read_segment(month):
+    with gzip.open(os.path.join("archive", f"{month}.jsonl.gz"), 'rt', encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+def test_archive_moves_old_events_and_keeps_recent_and_unparseable(app):
+    upcoming = (datetime.now() + timedelta(days=10)).strftime("%Y-%m-%d")
+    app.events = [
+        make_event("old", "2020-01-05", attendees=2),
+        make_event("new", upcoming),
+        make_event("bad", "01/02/20"),
+    ]
+
+    assert app.archive_past_events() == 1
+    assert [e['id'] for e in app.events] == ["new", "bad"]
+    assert [e['id'] for e in read_segment("2020-01")] == ["old"]
+    with open("events.json") as file:
+        assert [e['id'] for e in json.load(file)] == ["new", "bad"]
+
+
+def test_archive_appends_to_existing_segment_and_updates_index(app):
+    app.events = [make_event("a", "2020-01-05", "Social", attendees=1),
+                  make_event("b", "2020-01-09", "Workshop")]
+    app.archive_past_events()
+    app.events.append(make_event("c", "2020-01-20", "Social", attendees=3))
+
+    assert app.archive_past_events() == 1
+    assert [e['id'] for e in read_segment("2020-01")] == ["a", "b", "c"]
+    assert app.archive_index == {"2020-01": {
+        "Social": {'events': 2, 'attendees': 4},
+        "Workshop": {'events': 1, 'attendees': 0},
+    }}
+    with open(app.archive_index_file) as file:
+        assert json.load(file) == app.archive_index
+    assert app.archive_stats() == {
+        "Social": {'events': 2, 'attendees': 4},
+        "Workshop": {'events': 1, 'attendees': 0},
+    }
+
+
+def test_query_archive_filters_and_skips_months_by_index(app, monkeypatch):
+    app.events = [make_event("jan", "2020-01-05", "Social"),
+                  make_event("feb", "2020-02-05", "Workshop"),
+                  make_event("mar", "2020-03-05", "Social")]
+    app.archive_past_events()
+
+    read_months = []
+    read_archive_segment = app.read_archive_segment
+    monkeypatch.setattr(app, "read_archive_segment",
+                        lambda month: read_months.append(month) or read_archive_segment(month))
+
+    assert [e['id'] for e in app.query_archive("2020-02-01", "2020-03-31")] == ["feb", "mar"]
+    assert read_months == ["2020-02", "2020-03"]
+
+    read_months.clear()
+    assert [e['id'] for e in app.query_archive(category="Workshop")] == ["feb"]
+    assert read_months == ["2020-02"]
+
+    assert [e['id'] for e in app.query_archive("2020-01-05", "2020-01-05")] == ["jan"]
+
+
+def test_archive_retry_after_failed_save_does_not_duplicate(app, monkeypatch):
+    app.events = [make_event("a", "2020-01-05", attendees=1)]
+    with monkeypatch.context() as patch:
+        patch.setattr(app, "save_events", lambda: False)
+        assert app.archive_past_events() == 0
+
+    # The live store on disk was never updated, so the next launch sees the event again
+    app.events = [make_event("a", "2020-01-05", attendees=1)]
+    app.archive_past_events()
+
+    assert [e['id'] for e in read_segment("2020-01")] == ["a"]
+    assert app.archive_index == {"2020-01": {"Social": {'events': 1, 'attendees': 1}}}
+    assert app.events == []
+
+
+def test_failed_segment_write_leaves_index_and_events_untouched(app, monkeypatch):
+    app.events = [make_event("a", "2020-01-05"), make_event("b", "2020-02-05")]
+
+    def fail_on_february(month, repair=False):
+        if month == "2020-02":
+            raise OSError("disk full")
+        return []
+    monkeypatch.setattr(app, "read_archive_segment", fail_on_february)
+
+    assert app.archive_past_events() == 0
+    assert app.archive_index == {}
+    assert [e['id'] for e in app.events] == ["a", "b"]
+    assert app.errors
+
+
+def test_archive_threshold_is_persisted(app):
+    app.settings['archive_after_days'] = 365
+    app.save_settings()
+
+    assert app.load_settings() == {'archive_after_days': 365}
+    assert not os.path.exists("settings.json.tmp")
+
+
+def test_calendar_finds_archived_events_after_threshold_is_raised(app):
+    old_date = (datetime.now() - timedelta(days=60)).strftime("%Y-%m-%d")
+    app.events = [make_event("old", old_date)]
+    app.archive_past_events()
+
+    app.archive_after_days = 365
+
+    assert [e['id'] for e in app.events_on_date(old_date)] == ["old"]
+
+
+def test_truncated_segment_tail_is_dropped_and_repaired(app):
+    app.events = [make_event("a", "2020-01-05"), make_event("b", "2020-01-09")]
+    app.archive_past_events()
+
+    # Simulate a crash part way through appending another gzip member
+    member = gzip.compress((json.dumps(make_event("lost", "2020-01-20")) + "\n").encode())
+    with open(os.path.join("archive", "2020-01.jsonl.gz"), 'ab') as file:
+        file.write(member[:len(member) // 2])
+
+    assert [e['id'] for e in app.query_archive()] == ["a", "b"]
+    assert not app.errors
+
+    app.events = [make_event("c", "2020-01-25")]
+    assert app.archive_past_events() == 1
+    assert [e['id'] for e in read_segment("2020-01")] == ["a", "b", "c"]
+    assert app.archive_index == {"2020-01": {"Social": {'events': 3, 'attendees': 0}}}
+
+
+@pytest.mark.parametrize("index_contents", [None, "{not json"])
+def test_missing_or_corrupt_index_is_rebuilt_from_segments(app, index_contents):
+    app.events = [make_event("jan", "2020-01-05", attendees=2),
+                  make_event("feb", "2020-02-05", "Workshop")]
+    app.archive_past_events()
+    if index_contents is None:
+        os.remove(app.archive_index_file)
+    else:
+        with open(app.archive_index_file, 'w') as file:
+            file.write(index_contents)
+
+    app.init_storage()
+    app.events = [make_event("jan2", "2020-01-20")]
+    app.archive_past_events()
+
+    assert app.archive_index == {
+        "2020-01": {"Social": {'events': 2, 'attendees': 2}},
+        "2020-02": {"Workshop": {'events': 1, 'attendees': 0}},
+    }
+    assert [e['id'] for e in app.query_archive()] == ["jan", "jan2", "feb"]